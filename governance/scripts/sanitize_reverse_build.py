@@ -16,17 +16,28 @@ Redactions:
 - Private IPv4 addresses (RFC1918)
 - in-addr.arpa reverse lookup records
 - Sentry ingestion keys in URLs (sentry_key=...)
+
+JSON is decoded/encoded with `orjson` when it is installed (much faster on
+large captures) and with the stdlib `json` module otherwise.
 """
 
 from __future__ import annotations
 
 import argparse
-import ipaddress
 import json
+import os
 import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 from typing import Any
 
+try:
+    import orjson
+except ImportError:  # Optional speedup; the stdlib json codec is used without it.
+    orjson = None
+
 
 _RE_WIN_USER = re.compile(r"[A-Za-z]:\\Users\\[^\\]+")
 _RE_POSIX_USER = re.compile(r"[A-Za-z]:/Users/[^/]+")
@@ -35,18 +46,43 @@ _RE_HOST_DESKTOP = re.compile(r"Desktop-[^\\s\"/]+")
 _RE_IPV4 = re.compile(r"\b\d{1,3}(?:\.\d{1,3}){3}\b")
 _RE_SENTRY_KEY = re.compile(r"(sentry_key=)[0-9a-fA-F]+")
 _RE_IN_ADDR = re.compile(r"[0-9.]+\.in-addr\.arpa\.?")
+_RE_LONG_DIGITS = re.compile(r"[0-9]{19}")
+
+# ProcessPoolExecutor rejects more than 61 workers on Windows.
+_MAX_WINDOWS_JOBS = 61
 
 
 def _is_private_ipv4(value: str) -> bool:
-    try:
-        ip = ipaddress.ip_address(value)
-    except ValueError:
+    # Mirrors ipaddress' is_private/is_loopback/is_link_local for IPv4 with plain
+    # integer comparisons; `value` is a dotted quad matched by _RE_IPV4.
+    if not value.isascii():
+        return False  # \d also matches non-ASCII digits, which ipaddress rejects.
+    octets = value.split(".")
+    for octet in octets:
+        if octet[0] == "0" and len(octet) > 1:
+            return False  # ipaddress rejects leading zeros.
+    a, b, c, d = int(octets[0]), int(octets[1]), int(octets[2]), int(octets[3])
+    if a > 255 or b > 255 or c > 255 or d > 255:
         return False
-    return isinstance(ip, ipaddress.IPv4Address) and (
-        ip.is_private or ip.is_loopback or ip.is_link_local
+    return (
+        a in (0, 10, 127)
+        or a >= 240
+        or (a == 169 and b == 254)
+        or (a == 172 and 16 <= b <= 31)
+        or (a == 192 and b == 168)
+        or (a == 192 and b == 0 and c == 0 and (d < 8 or d in (170, 171)))
+        or (a == 192 and b == 0 and c == 2)
+        or (a == 198 and b in (18, 19))
+        or (a == 198 and b == 51 and c == 100)
+        or (a == 203 and b == 0 and c == 113)
     )
 
 
+def _redact_ip(match: re.Match[str]) -> str:
+    ip = match.group(0)
+    return "<private-ip>" if _is_private_ipv4(ip) else ip
+
+
 def _sanitize_string(text: str) -> str:
     # Strip UTF-8 BOM if present as a character (common when we ingest tool output).
     text = text.lstrip("\ufeff")
@@ -57,25 +93,66 @@ def _sanitize_string(text: str) -> str:
     text = _RE_SENTRY_KEY.sub(r"\1<redacted>", text)
     text = _RE_IN_ADDR.sub("<redacted.in-addr.arpa>", text)
     text = _RE_HOST_DESKTOP.sub("<redacted-hostname>", text)
-
-    def repl_ip(match: re.Match[str]) -> str:
-        ip = match.group(0)
-        return "<private-ip>" if _is_private_ipv4(ip) else ip
-
-    text = _RE_IPV4.sub(repl_ip, text)
-    return text
+    return _RE_IPV4.sub(_redact_ip, text)
 
 
 def _sanitize_json(value: Any) -> Any:
+    # Sanitizes decoded JSON in place (the document is rewritten anyway), walking
+    # containers with an explicit stack so deep nesting cannot hit the recursion
+    # limit. Returns `value`, or its sanitized copy when it is a bare string.
     if isinstance(value, str):
         return _sanitize_string(value)
-    if isinstance(value, list):
-        return [_sanitize_json(v) for v in value]
-    if isinstance(value, dict):
-        return {k: _sanitize_json(v) for k, v in value.items()}
+    stack: list[Any] = [value]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            items = node.items()
+        elif isinstance(node, list):
+            items = enumerate(node)
+        else:
+            continue
+        for key, child in items:
+            if isinstance(child, str):
+                node[key] = _sanitize_string(child)
+            elif isinstance(child, (dict, list)):
+                stack.append(child)
     return value
 
 
+def _contains_float(value: Any) -> bool:
+    stack: list[Any] = [value]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, float):
+            return True
+        if isinstance(node, dict):
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+    return False
+
+
+def _sanitize_json_text(raw: str) -> str:
+    # Raises json.JSONDecodeError when `raw` is not JSON. Output must not depend on
+    # whether orjson is installed: orjson reads integers outside the 64-bit range as
+    # floats (so any 19+ digit run goes to the stdlib decoder) and formats floats
+    # differently from repr() (so documents with floats use the stdlib encoder).
+    if orjson is not None and not _RE_LONG_DIGITS.search(raw):
+        try:
+            data = orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass  # NaN, Infinity, etc.: leave those to the stdlib codec below.
+        else:
+            sanitized = _sanitize_json(data)
+            if _contains_float(sanitized):
+                return json.dumps(sanitized, indent=2, ensure_ascii=False) + "\n"
+            return orjson.dumps(sanitized, option=orjson.OPT_INDENT_2).decode("utf-8") + "\n"
+
+    data = json.loads(raw)
+    sanitized = _sanitize_json(data)
+    return json.dumps(sanitized, indent=2, ensure_ascii=False) + "\n"
+
+
 def _write_text(path: Path, content: str, in_place: bool) -> Path:
     out = path if in_place else path.with_suffix(path.suffix + ".sanitized")
     out.write_text(content, encoding="utf-8", newline="\n")
@@ -86,13 +163,11 @@ def sanitize_file(path: Path, in_place: bool) -> Path:
     if path.suffix.lower() == ".json":
         raw = path.read_text(encoding="utf-8-sig")
         try:
-            data = json.loads(raw)
+            content = _sanitize_json_text(raw)
         except json.JSONDecodeError:
             # Fall back to text sanitization.
             return _write_text(path, _sanitize_string(raw), in_place=in_place)
 
-        sanitized = _sanitize_json(data)
-        content = json.dumps(sanitized, indent=2, ensure_ascii=False) + "\n"
         return _write_text(path, content, in_place=in_place)
 
     if path.suffix.lower() == ".csv":
@@ -104,6 +179,10 @@ def sanitize_file(path: Path, in_place: bool) -> Path:
 
 
 def main() -> int:
+    default_jobs = os.cpu_count() or 1
+    if sys.platform == "win32":
+        default_jobs = min(_MAX_WINDOWS_JOBS, default_jobs)
+
     parser = argparse.ArgumentParser()
     parser.add_argument(
         "--root",
@@ -115,7 +194,17 @@ def main() -> int:
         action="store_true",
         help="Overwrite original files instead of writing `.sanitized` copies.",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=default_jobs,
+        help="Worker processes used to sanitize files in parallel (default: CPU count).",
+    )
     args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    if sys.platform == "win32" and args.jobs > _MAX_WINDOWS_JOBS:
+        parser.error(f"--jobs cannot exceed {_MAX_WINDOWS_JOBS} on Windows")
 
     root = Path(args.root)
     if not root.exists():
@@ -127,8 +216,16 @@ def main() -> int:
         if p.is_file() and p.suffix.lower() in {".json", ".csv"}
     ]
 
-    for path in sorted(targets):
-        sanitize_file(path, in_place=args.in_place)
+    targets.sort()
+    if args.jobs == 1 or len(targets) <= 1:
+        for path in targets:
+            sanitize_file(path, in_place=args.in_place)
+        return 0
+
+    # Files are independent, so they are spread across processes; the regex and
+    # JSON work is CPU-bound and would not overlap in threads.
+    with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+        list(executor.map(partial(sanitize_file, in_place=args.in_place), targets, chunksize=4))
 
     return 0
 
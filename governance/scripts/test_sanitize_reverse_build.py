@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Regression tests for sanitize_reverse_build.py.
+
+Run from the repo root with:
+
+    python -m unittest governance/scripts/test_sanitize_reverse_build.py
+
+The fuzz test compares `_sanitize_string` against the original implementation:
+one regex pass per redaction, applied in order, with `ipaddress` deciding which
+IPv4 addresses are private. Any optimization of the sanitizer must keep
+redacting everything the baseline redacts.
+"""
+
+from __future__ import annotations
+
+import ipaddress
+import random
+import re
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import sanitize_reverse_build as sanitizer  # noqa: E402
+
+
+def _baseline_sanitize_string(text: str) -> str:
+    def repl_ip(match: re.Match[str]) -> str:
+        ip = match.group(0)
+        try:
+            addr = ipaddress.ip_address(ip)
+        except ValueError:
+            return ip
+        private = isinstance(addr, ipaddress.IPv4Address) and (
+            addr.is_private or addr.is_loopback or addr.is_link_local
+        )
+        return "<private-ip>" if private else ip
+
+    text = text.lstrip("\ufeff")
+    text = re.sub(r"[A-Za-z]:\\Users\\[^\\]+", r"<drive>:\\Users\\<user>", text)
+    text = re.sub(r"[A-Za-z]:/Users/[^/]+", "<drive>:/Users/<user>", text)
+    text = re.sub(r"\b[A-Za-z]:(?=[\\/])", "<drive>:", text)
+    text = re.sub(r"(sentry_key=)[0-9a-fA-F]+", r"\1<redacted>", text)
+    text = re.sub(r"[0-9.]+\.in-addr\.arpa\.?", "<redacted.in-addr.arpa>", text)
+    text = re.sub(r"Desktop-[^\\s\"/]+", "<redacted-hostname>", text)
+    return re.sub(r"\b\d{1,3}(?:\.\d{1,3}){3}\b", repl_ip, text)
+
+
+# Fragments that redactions are built from, plus the separators and boundary
+# characters that decide where one match ends and the next begins.
+_TOKENS = [
+    "C:\\Users\\bob\\", "c:/Users/alice", "/Users/", "\\Users\\", "E:\\", "f:/", "a:",
+    "sentry_key=", "abcDEF12", "Desktop-", "FOO1", ".in-addr.arpa", "in-addr", "arpa",
+    "10.0.0.5", "127.0.0.1", "192.168.1.1", "169.254.1.1", "8.8.8.8", "00.", "1", "0",
+    ".", " ", "\"", "\n", "/", "\\", "s", "D", "x", "<", ",", ":", "-", "_",
+    "\u0661", "\ufeff",
+]
+
+# Values that must never survive sanitization when the baseline removes them.
+_SECRETS = [
+    "bob", "alice", "carol", "abcDEF12", "FOO1",
+    "10.0.0.5", "127.0.0.1", "192.168.1.1", "169.254.1.1",
+]
+
+
+class SanitizeStringTests(unittest.TestCase):
+    def test_known_inputs(self) -> None:
+        cases = {
+            "c:/Users/alice,C:\\Users\\bob,c:/Users/carol\n": "<drive>:/Users/<user>",
+            "host=in-addr.arpa00.127.0.0.1": "host=in-addr.arpa00.<private-ip>",
+            "1.in-addr.arpa10.0.0.1": "<redacted.in-addr.arpa><private-ip>",
+            "10.0.0.1Desktop-x": "<private-ip><redacted-hostname>",
+            "url?sentry_key=ab12cd&x=1": "url?sentry_key=<redacted>&x=1",
+        }
+        for text, expected in cases.items():
+            with self.subTest(text=text):
+                self.assertEqual(sanitizer._sanitize_string(text), expected)
+
+    def test_private_ipv4_matches_ipaddress(self) -> None:
+        rng = random.Random(0)
+        octets = ["0", "00", "01", "1", "10", "16", "31", "127", "168", "169", "172", "192", "254", "255", "256", "999"]
+        for _ in range(20000):
+            value = ".".join(rng.choice(octets) for _ in range(4))
+            try:
+                addr = ipaddress.ip_address(value)
+                expected = addr.is_private or addr.is_loopback or addr.is_link_local
+            except ValueError:
+                expected = False
+            with self.subTest(value=value):
+                self.assertEqual(sanitizer._is_private_ipv4(value), expected)
+
+    def test_fuzz_never_keeps_what_baseline_redacts(self) -> None:
+        rng = random.Random(20260219)
+        for _ in range(50000):
+            text = "".join(rng.choice(_TOKENS) for _ in range(rng.randint(1, 12)))
+            expected = _baseline_sanitize_string(text)
+            actual = sanitizer._sanitize_string(text)
+            for secret in _SECRETS:
+                if actual.count(secret) > expected.count(secret):
+                    self.fail(f"{secret!r} leaked for {text!r}: {actual!r} (baseline {expected!r})")
+            self.assertEqual(actual, expected, msg=repr(text))
+
+
+class SanitizeJsonTextTests(unittest.TestCase):
+    @unittest.skipIf(sanitizer.orjson is None, "orjson is not installed")
+    def test_output_does_not_depend_on_orjson(self) -> None:
+        documents = [
+            '{"id": 18446744073709551616, "big": 123456789012345678901234567890}',
+            '[18446744073709551615, -9223372036854775808, -9223372036854775809]',
+            '{"small": 1e-07, "large": 1e+20, "half": 0.5, "neg": -0.0}',
+            '{"path": "C:\\\\Users\\\\bob\\\\x", "ip": "10.0.0.1", "n": 3, "s": "\\u001f\\u00e9"}',
+            '[{}, [], null, true, false, "1234567890123456789012"]',
+        ]
+        for raw in documents:
+            with self.subTest(raw=raw):
+                with_orjson = sanitizer._sanitize_json_text(raw)
+                with mock.patch.object(sanitizer, "orjson", None):
+                    without_orjson = sanitizer._sanitize_json_text(raw)
+                self.assertEqual(with_orjson, without_orjson)
+
+
+if __name__ == "__main__":
+    unittest.main()
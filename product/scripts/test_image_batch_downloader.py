@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Regression tests for image_batch_downloader.py.
+
+Run from the repo root with:
+
+    python -m unittest product/scripts/test_image_batch_downloader.py
+
+The page fixtures are UTF-8 with non-ASCII filenames and link text, so a page
+decoded with the wrong charset shows up as mangled URLs or missed "next" links.
+"""
+
+from __future__ import annotations
+
+import sys
+import tarfile
+import tempfile
+import unittest
+from pathlib import Path
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import image_batch_downloader as downloader  # noqa: E402
+
+_BASE = "https://example.org/galerie"
+
+_GALLERY_HTML = """<!doctype html>
+<html><head><link rel="next" href="/galerie?seite=2"></head><body>
+<div class="author-box"><img src="/u/avatar_jürgen.png" alt="Jürgen"></div>
+<img src="/fotos/café_thumb.jpg" srcset="/fotos/café_thumb.jpg 320w, /fotos/café.jpg 1280w">
+<a href="/fotos/strand.jpg"><img src="/fotos/strand_sm.jpg"></a>
+<a href="/fotos/straße.png">Bild</a>
+<a href="/galerie/3">Nächste ›</a>
+<a class="nav-links" href="/archiv">Archiv</a>
+<nav class="Pagination"><span><a href="/galerie/4">4</a></span></nav>
+<a href="/posts/über-uns">Über uns</a>
+</body></html>
+"""
+
+
+def _response(body: bytes, content_type: str) -> requests.Response:
+    resp = requests.Response()
+    resp.status_code = 200
+    resp._content = body
+    resp.headers["Content-Type"] = content_type
+    resp.encoding = requests.utils.get_encoding_from_headers(resp.headers)
+    return resp
+
+
+def _parse(resp: requests.Response) -> downloader.PageElements:
+    page = downloader.parse_page(resp.content, downloader.page_encoding(resp))
+    assert page is not None
+    return page
+
+
+class ParseSrcsetBestTests(unittest.TestCase):
+    def test_picks_largest_descriptor(self) -> None:
+        cases = {
+            "a.jpg 300w, b.jpg 1200w, c.jpg 800w": "https://example.org/x/b.jpg",
+            "a.jpg 1x, b.jpg 2x": "https://example.org/x/b.jpg",
+            "a.jpg, b.jpg": "https://example.org/x/a.jpg",
+            "javascript:void(0) 2000w, ok.jpg 100w": "https://example.org/x/ok.jpg",
+            "/fotos/café-klein.jpg 320w, /fotos/café.jpg 1280w": "https://example.org/fotos/café.jpg",
+        }
+        for srcset, expected in cases.items():
+            with self.subTest(srcset=srcset):
+                self.assertEqual(downloader.parse_srcset_best(srcset, "https://example.org/x/"), expected)
+
+    def test_empty_srcset(self) -> None:
+        self.assertIsNone(downloader.parse_srcset_best("", "https://example.org/"))
+
+
+class GuessFullsizeVariantsTests(unittest.TestCase):
+    def test_variants(self) -> None:
+        cases = {
+            "https://example.org/img/photo.jpg": ["https://example.org/img/photo.jpg"],
+            "https://example.org/img/photo1_thumb.jpg": [
+                "https://example.org/img/photo1_thumb.jpg",
+                "https://example.org/img/photo1.jpg",
+            ],
+            "https://example.org/i/a.jpg?w=300&id=7": [
+                "https://example.org/i/a.jpg?w=300&id=7",
+                "https://example.org/i/a.jpg?id=7",
+            ],
+            "https://example.org/thumbs/x.png": [
+                "https://example.org/thumbs/x.png",
+                "https://example.org/x.png",
+            ],
+            "https://example.org/fotos/größe_thumb.jpg": [
+                "https://example.org/fotos/größe_thumb.jpg",
+                "https://example.org/fotos/größe.jpg",
+            ],
+        }
+        for url, expected in cases.items():
+            with self.subTest(url=url):
+                self.assertEqual(downloader.guess_fullsize_variants(url), expected)
+
+
+class PageEncodingTests(unittest.TestCase):
+    def test_charset_choice(self) -> None:
+        body = _GALLERY_HTML.encode("utf-8")
+        meta = b'<meta charset="utf-8">' + body
+        self.assertEqual(downloader.page_encoding(_response(body, "text/html; charset=UTF-8")), "UTF-8")
+        self.assertIsNone(downloader.page_encoding(_response(meta, "text/html")))
+        self.assertEqual(downloader.page_encoding(_response(body, "text/html")).lower(), "utf-8")
+
+    def test_utf8_page_without_meta_charset(self) -> None:
+        body = _GALLERY_HTML.encode("utf-8")
+        for content_type in ("text/html; charset=utf-8", "text/html"):
+            with self.subTest(content_type=content_type):
+                page = _parse(_response(body, content_type))
+                urls = [u for c in downloader.extract_image_candidates(page, _BASE, {}) for u in c.urls]
+                self.assertIn("https://example.org/fotos/café.jpg", urls)
+                self.assertNotIn("https://example.org/fotos/cafÃ©.jpg", urls)
+                next_links, _ = downloader.discover_links(page, _BASE, False, {})
+                self.assertIn("https://example.org/galerie/3", next_links)
+
+    def test_unknown_charset_falls_back(self) -> None:
+        page = _parse(_response(b'<meta charset="utf-8"><img src="/caf\xc3\xa9.jpg">', "text/html; charset=bogus"))
+        self.assertEqual(page.images[0].get("src"), "/café.jpg")
+
+
+class ExtractImageCandidatesTests(unittest.TestCase):
+    def test_gallery_fixture(self) -> None:
+        page = downloader.parse_page(_GALLERY_HTML.encode("utf-8"), "utf-8")
+        candidates = downloader.extract_image_candidates(page, _BASE, {})
+        self.assertEqual(
+            [(c.urls, c.skip_profile) for c in candidates],
+            [
+                (("https://example.org/u/avatar_jürgen.png",), True),
+                (("https://example.org/fotos/café.jpg", "https://example.org/fotos/café_thumb.jpg"), False),
+                (
+                    (
+                        "https://example.org/fotos/strand.jpg",
+                        "https://example.org/fotos/strand_sm.jpg",
+                    ),
+                    False,
+                ),
+                (("https://example.org/fotos/straße.png",), False),
+            ],
+        )
+        self.assertTrue(all(c.page_url == _BASE for c in candidates))
+
+
+class DiscoverLinksTests(unittest.TestCase):
+    def test_gallery_fixture(self) -> None:
+        page = downloader.parse_page(_GALLERY_HTML.encode("utf-8"), "utf-8")
+        next_links, content_links = downloader.discover_links(page, _BASE, True, {})
+        self.assertEqual(
+            list(next_links),
+            [
+                "https://example.org/galerie?seite=2",
+                "https://example.org/galerie/3",
+                "https://example.org/galerie/4",
+            ],
+        )
+        self.assertEqual(list(content_links), ["https://example.org/posts/über-uns"])
+
+    def test_content_links_are_opt_in(self) -> None:
+        page = downloader.parse_page(_GALLERY_HTML.encode("utf-8"), "utf-8")
+        _, content_links = downloader.discover_links(page, _BASE, False, {})
+        self.assertEqual(content_links, {})
+
+
+class ImageStoreTests(unittest.TestCase):
+    def test_failed_write_fails_its_future_and_later_writes(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            missing = Path(tmp) / "missing"
+            with downloader.ImageStore("files") as store:
+                first = store.write(missing, "a.jpg", bytearray(b"a"))
+                with self.assertRaises(FileNotFoundError):
+                    first.result()
+                with self.assertRaises(FileNotFoundError):
+                    store.write(Path(tmp), "b.jpg", bytearray(b"b"))
+            self.assertEqual(list(Path(tmp).iterdir()), [])
+
+    def test_write_resolves_to_stored_path(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            with downloader.ImageStore("files") as store:
+                path = store.write(Path(tmp), "a.jpg", bytearray(b"a")).result()
+            self.assertEqual(path.read_bytes(), b"a")
+
+    def test_rerun_does_not_duplicate_tar_members(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            output_dir = Path(tmp) / "host" / "images"
+            for _ in range(2):
+                with downloader.ImageStore("tar") as store:
+                    store.write(output_dir, "a.jpg", bytearray(b"a")).result()
+                    store.write(output_dir, "b.jpg", bytearray(b"b")).result()
+            with tarfile.open(output_dir.with_suffix(".tar")) as tf:
+                self.assertEqual(tf.getnames(), ["a.jpg", "b.jpg"])
+
+
+if __name__ == "__main__":
+    unittest.main()